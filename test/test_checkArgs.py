@@ -0,0 +1,80 @@
+import os
+from test import TEST_DIR, pushd
+
+import pytest
+
+import RAiDER.runProgram
+from RAiDER.checkArgs import checkArgs
+
+
+@pytest.fixture
+def delay_parser():
+    return RAiDER.runProgram.create_parser()
+
+
+STATION_FILE = os.path.join(TEST_DIR, 'scenario_2', 'stations.csv')
+LAT_FILE = os.path.join(TEST_DIR, 'test_geom', 'lat.rdr')
+LON_FILE = os.path.join(TEST_DIR, 'test_geom', 'lon.rdr')
+BBOX = ['--bbox', '10', '12', '-100', '-98']
+
+
+def parse_delay_args(parser, *args):
+    return parser.parse_args([
+        '--date', '20200103',
+        '--time', '23:00:00',
+        '--model', 'ERA5',
+        *args
+    ])
+
+
+def test_checkArgs_default_out(delay_parser, tmp_path):
+    # The parser defaults --out to '.', but callers building args
+    # themselves may leave it unset
+    args = parse_delay_args(delay_parser, *BBOX)
+    args.out = None
+
+    with pushd(tmp_path):
+        result = checkArgs(args, delay_parser)
+        cwd = os.getcwd()
+
+    assert result.out == cwd
+    assert result.wmLoc == os.path.join(cwd, 'weather_files')
+    assert os.path.isdir(result.wmLoc)
+
+
+@pytest.mark.parametrize('area, outformat', [
+    (BBOX, 'hdf5'),
+    (['--station_file', STATION_FILE], 'csv'),
+    (['--latlon', LAT_FILE, LON_FILE], 'envi'),
+    (BBOX + ['--heightlvs', '0', '100', '500'], 'hdf5'),
+    (['--station_file', STATION_FILE, '--heightlvs', '0', '100'], 'hdf5'),
+])
+def test_checkArgs_default_outformat(delay_parser, tmp_path, area, outformat):
+    args = parse_delay_args(delay_parser, *area, '--out', str(tmp_path))
+    assert checkArgs(args, delay_parser).outformat == outformat
+
+
+@pytest.mark.parametrize('requested', ['h5', 'hdf', 'HDF5'])
+def test_checkArgs_hdf5_aliases(delay_parser, tmp_path, requested):
+    args = parse_delay_args(
+        delay_parser, *BBOX, '--heightlvs', '0', '100',
+        '--outformat', requested, '--out', str(tmp_path)
+    )
+    assert checkArgs(args, delay_parser).outformat == 'hdf5'
+
+
+def test_checkArgs_keeps_requested_outformat(delay_parser, tmp_path):
+    args = parse_delay_args(
+        delay_parser, '--station_file', STATION_FILE,
+        '--outformat', 'hdf', '--out', str(tmp_path)
+    )
+    assert checkArgs(args, delay_parser).outformat == 'hdf5'
+
+
+def test_checkArgs_lvs_requires_hdf5(delay_parser, tmp_path):
+    args = parse_delay_args(
+        delay_parser, *BBOX, '--heightlvs', '0', '100',
+        '--outformat', 'envi', '--out', str(tmp_path)
+    )
+    with pytest.raises(RuntimeError):
+        checkArgs(args, delay_parser)
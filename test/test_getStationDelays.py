@@ -0,0 +1,44 @@
+import gzip
+import os
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from RAiDER.getStationDelays import get_delays
+
+
+def test_get_delays_missing_times(tmp_path):
+    '''
+    A day with missing times is padded with NaNs; each output column must
+    keep its own values
+    '''
+    seconds = np.array([0, 300, 900, 1500])
+    lines = ['+TROP/SOLUTION', '*SITE EPOCH_______ TROTOT STDDEV']
+    for k, s in enumerate(seconds):
+        # ZTD, sigma, wet, east grad, sigma, north grad, sigma, PWV, sigma, T
+        values = [
+            2400 + k, 1 + k, 100, 0.1 + k, 0.01, -0.2 - k, 0.02, 10, 1, 280
+        ]
+        lines.append(
+            'ABCD 20:003:{:05d} '.format(s) + ' '.join(map(str, values))
+        )
+    lines.append('-TROP/SOLUTION')
+
+    stationFile = os.path.join(tmp_path, 'ABCD.zip')
+    with zipfile.ZipFile(stationFile, 'w') as z:
+        z.writestr(
+            'ABCD.2020.003.trop.gz', gzip.compress('\n'.join(lines).encode())
+        )
+
+    outFile = os.path.join(tmp_path, 'ABCD_ztd.csv')
+    get_delays(stationFile, outFile)
+    df = pd.read_csv(outFile)
+
+    assert len(df) == 288
+    observed = df['times'].isin(seconds).values
+    assert np.allclose(df['ZTD'][observed], 2400 + np.arange(4))
+    assert np.allclose(df['sigZTD'][observed], 1 + np.arange(4))
+    assert np.allclose(df['east_grad'][observed], 0.1 + np.arange(4))
+    assert np.allclose(df['north_grad'][observed], -0.2 - np.arange(4))
+    assert df['ZTD'][~observed].isna().all()
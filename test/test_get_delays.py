@@ -0,0 +1,181 @@
+import os
+from test import pushd
+
+import h5py
+import numpy as np
+import pytest
+from pyproj import CRS
+
+from RAiDER.constants import Zenith
+from RAiDER.delayFcns import calculate_rays, get_delays
+from RAiDER.losreader import getLookVectors
+from RAiDER.utilFcns import writePnts2HDF5
+
+# Small synthetic scenes, so that get_delays can be checked end to end
+# without downloading a weather model
+ZREF = 3000.
+STEP = 10.
+
+
+def wet_refractivity(x, y, z):
+    return 50. * np.exp(-z / 2000.) * (1 + 0.2 * x)
+
+
+def hydro_refractivity(x, y, z):
+    return 250. * np.exp(-z / 8000.) * (1 + 0.1 * y)
+
+
+def make_weather_model_file(filename, wet, hydro):
+    '''
+    Write a weather model on a lat/lon/height grid to an HDF5 file, with
+    the refractivity given by functions of (lon, lat, height)
+    '''
+    xs = np.linspace(-1, 1, 21)
+    ys = np.linspace(-1, 1, 21)
+    zs = np.linspace(-500, 6000, 66)
+    y, x, z = np.meshgrid(ys, xs, zs, indexing='ij')
+
+    with h5py.File(filename, 'w') as f:
+        f.create_dataset('x', data=xs)
+        f.create_dataset('y', data=ys)
+        f.create_dataset('z', data=zs)
+        f.create_dataset('wet', data=wet(x, y, z))
+        f.create_dataset('hydro', data=hydro(x, y, z))
+        f.create_dataset('Projection', data=CRS.from_epsg(4326).to_json())
+
+
+def make_points_file(filename, hgts, chunkSize=None, delayType='LOS'):
+    '''
+    Write zenith query points spread over the weather model to an HDF5 file
+    and compute their rays
+    '''
+    lats, lons = np.meshgrid(
+        np.linspace(-0.5, 0.5, hgts.shape[0]),
+        np.linspace(-0.4, 0.6, hgts.shape[1]),
+        indexing='ij'
+    )
+    los = getLookVectors(Zenith, lats, lons, hgts, ZREF)
+    writePnts2HDF5(
+        lats, lons, hgts, los, outName=filename, chunkSize=chunkSize
+    )
+    calculate_rays(filename, STEP, delayType=delayType)
+
+
+def test_get_delays_ray_cutoff(tmp_path):
+    '''
+    Rays are all sampled out to the longest ray, but each one should only
+    be integrated up to its own length. With constant refractivity the
+    delays count the points used on each ray.
+    '''
+    hgts = np.array([[3., 505., 1234.], [1766., 2222., 2877.]])
+    pnts_file = os.path.join(tmp_path, 'query_points.h5')
+    wm_file = os.path.join(tmp_path, 'weather_model.h5')
+
+    with pushd(tmp_path):
+        make_weather_model_file(
+            wm_file,
+            lambda x, y, z: np.ones(z.shape),
+            lambda x, y, z: np.full(z.shape, 2.)
+        )
+        make_points_file(pnts_file, hgts)
+        wet, hydro = get_delays(
+            STEP, pnts_file, wm_file, delayType='LOS', cpu_num=1
+        )
+
+    Npts = np.floor((ZREF - hgts) / STEP) + 1
+    assert wet.shape == hgts.shape
+    assert np.allclose(wet, 1e-6 * STEP * Npts)
+    assert np.allclose(hydro, 2e-6 * STEP * Npts)
+
+
+@pytest.mark.parametrize('delayType', ['Zenith', 'LOS'])
+def test_get_delays_chunks(tmp_path, delayType):
+    '''
+    Delays computed in several chunks should be put back in the same
+    place as when the whole array is one chunk
+    '''
+    hgts = np.linspace(0, 1900, 20).reshape(4, 5)
+    wm_file = os.path.join(tmp_path, 'weather_model.h5')
+    one_chunk = os.path.join(tmp_path, 'query_points_1.h5')
+    many_chunks = os.path.join(tmp_path, 'query_points_6.h5')
+
+    with pushd(tmp_path):
+        make_weather_model_file(wm_file, wet_refractivity, hydro_refractivity)
+        make_points_file(
+            one_chunk, hgts, chunkSize=(4, 5), delayType=delayType
+        )
+        make_points_file(
+            many_chunks, hgts, chunkSize=(2, 2), delayType=delayType
+        )
+
+        wet_1, hydro_1 = get_delays(
+            STEP, one_chunk, wm_file, delayType=delayType, cpu_num=1
+        )
+        wet_6, hydro_6 = get_delays(
+            STEP, many_chunks, wm_file, delayType=delayType, cpu_num=2
+        )
+
+    assert wet_6.shape == hgts.shape
+    assert np.all(np.isfinite(wet_6))
+    assert np.allclose(wet_1, wet_6)
+    assert np.allclose(hydro_1, hydro_6)
+
+
+def test_get_delays_zenith_matches_los(tmp_path):
+    '''
+    Zenith rays are sampled straight up in the weather model projection,
+    which should give the same delays as following the zenith look vectors
+    in ECEF
+    '''
+    hgts = np.array([[3., 505., 1234.], [1766., -45., 2877.]])
+    pnts_file = os.path.join(tmp_path, 'query_points.h5')
+    wm_file = os.path.join(tmp_path, 'weather_model.h5')
+
+    with pushd(tmp_path):
+        make_weather_model_file(wm_file, wet_refractivity, hydro_refractivity)
+        make_points_file(pnts_file, hgts)
+
+        wet_zen, hydro_zen = get_delays(
+            STEP, pnts_file, wm_file, delayType='Zenith', cpu_num=1
+        )
+        wet_los, hydro_los = get_delays(
+            STEP, pnts_file, wm_file, delayType='LOS', cpu_num=1
+        )
+
+    assert np.all(wet_zen > 0)
+    assert np.allclose(wet_zen, wet_los, rtol=1e-6, atol=0)
+    assert np.allclose(hydro_zen, hydro_los, rtol=1e-6, atol=0)
+
+
+@pytest.mark.parametrize('delayType', ['Zenith', 'LOS'])
+def test_get_delays_default_ray_type(tmp_path, delayType):
+    '''
+    Without a delayType, get_delays uses the rays that calculate_rays made
+    '''
+    hgts = np.array([[3., 505.], [1234., 1766.]])
+    pnts_file = os.path.join(tmp_path, 'query_points.h5')
+    wm_file = os.path.join(tmp_path, 'weather_model.h5')
+
+    with pushd(tmp_path):
+        make_weather_model_file(wm_file, wet_refractivity, hydro_refractivity)
+        make_points_file(pnts_file, hgts, delayType=delayType)
+
+        default = get_delays(STEP, pnts_file, wm_file, cpu_num=1)
+        explicit = get_delays(
+            STEP, pnts_file, wm_file, delayType=delayType, cpu_num=1
+        )
+
+    assert np.allclose(default, explicit)
+
+
+def test_get_delays_los_needs_los_rays(tmp_path):
+    hgts = np.array([[3., 505.], [1234., 1766.]])
+    pnts_file = os.path.join(tmp_path, 'query_points.h5')
+    wm_file = os.path.join(tmp_path, 'weather_model.h5')
+
+    with pushd(tmp_path):
+        make_weather_model_file(wm_file, wet_refractivity, hydro_refractivity)
+        make_points_file(pnts_file, hgts, delayType='Zenith')
+
+        with pytest.raises(RuntimeError):
+            get_delays(STEP, pnts_file, wm_file, delayType='LOS', cpu_num=1)
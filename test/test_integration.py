@@ -1,5 +1,10 @@
 import numpy as np
 
+from RAiDER.delayFcns import (
+    _integrate_delays, _integrate_segments, _integrate_zenith,
+    get_valid_samples, int_fcn
+)
+
 # The purpose of these tests is to verify that the axis parameter for trapz is
 # equivalent to calling apply_along_axis(trapz, axis).
 
@@ -41,3 +46,47 @@ def test_integrate_along_axis_large():
             np.apply_along_axis(np.trapz, 2, y[..., level:], x=x[level:]),
             np.trapz(y[..., level:], x[level:], axis=2)
         )
+
+
+def test_integrate_delays_matches_per_ray():
+    refr = np.random.standard_normal(60).reshape(2, 3, 10)
+    refr[0, 1, 4] = np.nan
+    Npts = np.array([[10, 3, 7], [1, 5, 10]])
+
+    expected = np.array([
+        int_fcn(ray, 15., n)
+        for n, ray in zip(Npts.ravel(), refr.reshape(-1, 10))
+    ]).reshape(Npts.shape)
+
+    assert np.allclose(_integrate_delays(15., refr, Npts), expected)
+    assert np.allclose(
+        _integrate_delays(15., refr),
+        1e-6 * 15. * np.nansum(refr, axis=-1)
+    )
+
+
+def test_integrate_zenith():
+    y = np.random.standard_normal(1000).reshape(10, 10, 10)
+    y[3, 4, 6] = np.nan
+    x = np.sort(np.random.uniform(0, 10000, size=y.shape[2]))
+
+    expected = np.zeros(y.shape)
+    for level in range(y.shape[2]):
+        expected[..., level] = 1e-6 * np.trapz(
+            y[..., level:], x=x[level:], axis=2
+        )
+
+    assert np.allclose(_integrate_zenith(y, x), expected, equal_nan=True)
+
+
+def test_integrate_segments():
+    refr = np.random.standard_normal(60).reshape(6, 10).astype(np.float32)
+    refr[1, 2] = np.nan
+    lengths = np.array([0., 25., 90., 150., 44., 3.])
+
+    keep, starts = get_valid_samples(lengths, 10., refr.shape[-1])
+
+    assert np.allclose(
+        _integrate_segments(10., refr[keep], starts),
+        _integrate_delays(10., refr, keep.sum(axis=-1))
+    )
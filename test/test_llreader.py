@@ -0,0 +1,19 @@
+import numpy as np
+
+from RAiDER.llreader import getHeights
+
+
+def test_getHeights_lvs():
+    lats = np.array([[10., 11., 12.], [13., 14., 15.]])
+    lons = lats + 100
+    levels = [0., 100., 500., 1000.]
+
+    out_lats, out_lons, out_hts = getHeights(lats, lons, ('lvs', levels))
+
+    assert out_lats.shape == lats.shape + (len(levels),)
+    assert out_lons.shape == lats.shape + (len(levels),)
+    assert out_hts.shape == lats.shape + (len(levels),)
+    for k, ht in enumerate(levels):
+        assert np.all(out_lats[..., k] == lats)
+        assert np.all(out_lons[..., k] == lons)
+        assert np.all(out_hts[..., k] == ht)
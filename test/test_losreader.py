@@ -0,0 +1,72 @@
+import numpy as np
+
+from RAiDER.losreader import los_to_lv, state_to_los
+from RAiDER.utilFcns import enu2ecef, lla2ecef
+
+
+def test_los_to_lv():
+    inc = np.random.uniform(20, 45, (3, 4))
+    hdg = np.random.uniform(-180, 180, (3, 4))
+    lats = np.random.uniform(-80, 80, (3, 4))
+    lons = np.random.uniform(-180, 180, (3, 4))
+    hgts = np.random.uniform(0, 3000, (3, 4))
+    zref = 15000.
+
+    los = los_to_lv(inc, hdg, lats, lons, hgts, zref)
+
+    # Same look vectors as the ground point plus look vector in ECEF, minus
+    # the ground point
+    up = np.cos(np.radians(inc))
+    ranges = (zref - hgts) / up
+    east = ranges * np.sin(np.radians(inc)) * np.cos(np.radians(hdg + 90))
+    north = ranges * np.sin(np.radians(inc)) * np.sin(np.radians(hdg + 90))
+    ground = np.stack(lla2ecef(lats, lons, hgts), axis=-1)
+    end = np.stack(
+        enu2ecef(east, north, ranges * up, lats, lons, hgts), axis=-1
+    )
+    assert los.shape == lats.shape + (3,)
+    assert np.allclose(los, end - ground, rtol=0, atol=1e-6)
+
+    # The local east, north and up directions, found directly from the
+    # geodetic to ECEF projection
+    def direction(dlat, dlon, dh):
+        d = np.stack(lla2ecef(lats + dlat, lons + dlon, hgts + dh), axis=-1)
+        d -= np.stack(lla2ecef(lats - dlat, lons - dlon, hgts - dh), axis=-1)
+        return d / np.linalg.norm(d, axis=-1)[..., np.newaxis]
+
+    expected = (
+        east[..., np.newaxis] * direction(0, 1e-5, 0)
+        + north[..., np.newaxis] * direction(1e-5, 0, 0)
+        + (ranges * up)[..., np.newaxis] * direction(0, 0, 1)
+    )
+    assert np.allclose(los, expected, rtol=0, atol=1e-3)
+
+
+def test_state_to_los():
+    # Circular polar orbit at 700 km crossing the equator at lon 0, seen
+    # from a grid of points a few degrees off the ground track
+    radius = 6378137. + 700e3
+    omega = np.sqrt(3.986004418e14 / radius**3)
+    t = np.linspace(-60, 60, 13)
+    x = radius * np.cos(omega * t)
+    y = np.zeros(t.shape)
+    z = radius * np.sin(omega * t)
+    vx = -radius * omega * np.sin(omega * t)
+    vy = np.zeros(t.shape)
+    vz = radius * omega * np.cos(omega * t)
+
+    lats, lons = np.meshgrid(
+        np.linspace(-0.5, 0.5, 3), np.linspace(2, 3, 4), indexing='ij'
+    )
+    hgts = np.zeros(lats.shape)
+
+    los = state_to_los(t, x, y, z, vx, vy, vz, lats, lons, hgts)
+
+    assert los.shape == lats.shape + (3,)
+    assert np.allclose(np.linalg.norm(los, axis=-1), 1)
+
+    # The orbit is symmetric about the equator, so the z component of each
+    # point's vector flips sign with its latitude
+    assert np.allclose(los[1, :, 2], 0, atol=1e-8)
+    assert np.allclose(los[0, :, 2], -los[-1, :, 2], atol=1e-5)
+    assert np.all(np.abs(los[0, :, 2]) > 1e-3)
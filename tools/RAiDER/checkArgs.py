@@ -7,6 +7,7 @@
 #
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 import os
+from collections import namedtuple
 from datetime import datetime
 
 import numpy as np
@@ -15,35 +16,48 @@ import RAiDER.utilFcns
 from RAiDER.constants import Zenith
 from RAiDER.llreader import readLL
 
+# Alternate spellings accepted for --outformat
+_OUTFORMAT_ALIASES = {'h5': 'hdf5', 'hdf': 'hdf5'}
+
+# Default output format for each type of query points; other inputs write ENVI
+_DEFAULT_OUTFORMATS = {'lvs': 'hdf5', 'station_file': 'csv', 'bounding_box': 'hdf5'}
+
+# Result of checkArgs; still unpacks positionally like a plain tuple
+ArgsResult = namedtuple('ArgsResult', [
+    'los', 'lats', 'lons', 'll_bounds', 'heights', 'flag', 'weathers', 'wmLoc',
+    'zref', 'outformat', 'times', 'out', 'download_only', 'verbose',
+    'wetNames', 'hydroNames'
+])
+
 
 def checkArgs(args, p):
     '''
     Helper fcn for checking argument compatibility and returns the
-    correct variables
+    correct variables as an ArgsResult
     '''
 
     # Argument checking
+    if args.outformat is not None:
+        outformat = args.outformat.lower()
+        outformat = _OUTFORMAT_ALIASES.get(outformat, outformat)
+    else:
+        outformat = None
+
     if args.heightlvs is not None:
-        if args.outformat is not None:
-            if args.outformat.lower() != 'hdf5':
+        if outformat is not None:
+            if outformat != 'hdf5':
                 raise RuntimeError('HDF5 must be used with height levels')
 
     # Area
     # flag depending on the type of input
     if args.latlon is not None:
         flag = 'files'
-    elif args.bbox is not None:
-        flag = 'bounding_box'
-    elif args.station_file is not None:
-        flag = 'station_file'
-    else:
-        flag = None
-
-    if args.latlon is not None:
         lat, lon, latproj, lonproj, bounds = readLL(*args.latlon)
     elif args.bbox is not None:
+        flag = 'bounding_box'
         lat, lon, latproj, lonproj, bounds = readLL(*args.bbox)
     elif args.station_file is not None:
+        flag = 'station_file'
         lat, lon, latproj, lonproj, bounds = readLL(args.station_file)
     elif args.files is None:
         raise NotImplementedError("Reading lat/lon data from files is not implemented")
@@ -65,7 +79,6 @@ def checkArgs(args, p):
     weather_model_name = args.model
     if weather_model_name == 'WRF' and args.files is None:
         raise RuntimeError('Argument --files is required with --model WRF')
-    _, model_obj = RAiDER.utilFcns.modelName2Module(args.model)
     if args.model == 'WRF':
         weathers = {'type': 'wrf', 'files': args.files,
                     'name': 'wrf'}
@@ -73,11 +86,13 @@ def checkArgs(args, p):
         weathers = {'type': 'HDF5', 'files': args.files,
                     'name': args.model}
     else:
+        # Only the models built from a module in RAiDER.models need the class
+        _, model_obj = RAiDER.utilFcns.modelName2Module(args.model)
         try:
             weathers = {'type': model_obj(), 'files': args.files,
                         'name': args.model}
         except:
-            raise NotImplementedError('{} is not implemented'.format(weather_model_name))
+            raise NotImplementedError(f'{weather_model_name} is not implemented')
 
     # zref
     zref = args.zref
@@ -94,35 +109,31 @@ def checkArgs(args, p):
     out = args.out
     if out is None:
         out = os.getcwd()
-    if args.outformat is None:
-        if args.heightlvs is not None:
-            outformat = 'hdf5'
-        elif args.station_file is not None:
-            outformat = 'csv'
-        elif useWeatherNodes:
-            outformat = 'hdf5'
-        else:
-            outformat = 'envi'
-    else:
-        outformat = args.outformat.lower()
+    if outformat is None:
+        outformat = _DEFAULT_OUTFORMATS.get(
+            'lvs' if args.heightlvs is not None else flag, 'envi')
     if args.wmLoc is not None:
         wmLoc = args.wmLoc
     else:
-        wmLoc = os.path.join(args.out, 'weather_files')
+        wmLoc = os.path.join(out, 'weather_files')
 
     if not os.path.exists(wmLoc):
         os.mkdir(wmLoc)
 
+    # The station file is the same for every datetime, so only read it once
+    if flag == 'station_file':
+        import pandas as pd
+        indf = pd.read_csv(args.station_file)
+
     wetNames, hydroNames = [], []
     for time in datetimeList:
         if flag == 'station_file':
-            wetFilename = os.path.join(out, '{}_Delay_{}_Zmax{}.csv'
-                                       .format(weather_model_name, time.strftime('%Y%m%dT%H%M%S'), zref))
+            time_str = time.strftime('%Y%m%dT%H%M%S')
+            wetFilename = os.path.join(
+                out, f'{weather_model_name}_Delay_{time_str}_Zmax{zref}.csv')
             hydroFilename = wetFilename
 
             # copy the input file to the output location for editing
-            import pandas as pd
-            indf = pd.read_csv(args.station_file)
             indf.to_csv(wetFilename, index=False)
         else:
             wetFilename, hydroFilename = \
@@ -143,4 +154,7 @@ def checkArgs(args, p):
     else:
         heights = ('download', os.path.join(out, 'geom', 'warpedDEM.dem'))
 
-    return los, lat, lon, bounds, heights, flag, weathers, wmLoc, zref, outformat, datetimeList, out, download_only, verbose, wetNames, hydroNames
+    return ArgsResult(
+        los, lat, lon, bounds, heights, flag, weathers, wmLoc, zref, outformat,
+        datetimeList, out, download_only, verbose, wetNames, hydroNames
+    )
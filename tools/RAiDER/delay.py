@@ -54,7 +54,7 @@ def interpolateDelay(weather_model_file_name, pnts_file_name,
     log.debug('ZREF = %s', zref)
     log.debug('stepSize = %f', stepSize)
 
-    RAiDER.delayFcns.calculate_rays(pnts_file_name, stepSize)
+    RAiDER.delayFcns.calculate_rays(pnts_file_name, stepSize, delayType=delayType)
     return RAiDER.delayFcns.get_delays(
         stepSize, pnts_file_name, weather_model_file_name,
         interpType=interpType, delayType=delayType
@@ -117,7 +117,7 @@ def tropo_delay(los, lats, lons, ll_bounds, heights, flag, weather_model, wmLoc,
 
     # Flags
     useWeatherNodes = flag == 'bounding_box'
-    delayType = ["Zenith" if los is Zenith else "LOS"]
+    delayType = "Zenith" if los is Zenith else "LOS"
 
     # location of the weather model files
     log.debug('Beginning weather model pre-processing')
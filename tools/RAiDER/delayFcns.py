@@ -22,21 +22,35 @@ from RAiDER.makePoints import makePoints1D
 
 log = logging.getLogger(__name__)
 
+# Interpolators and ECEF to weather model transformer used by the get_delays
+# worker processes. These are set once in each worker by _init_worker instead
+# of being sent along with (or rebuilt for) every chunk.
+_WORKER_STATE = {}
 
-def calculate_rays(pnts_file, stepSize=_STEP):
+
+def calculate_rays(pnts_file, stepSize=_STEP, delayType="LOS"):
     '''
     From a set of lats/lons/hgts, compute ray paths from the ground to the
-    top of the atmosphere, using either a set of look vectors or the zenith
+    top of the atmosphere, using either a set of look vectors or the zenith.
+    Zenith rays are sampled directly in the weather model projection by
+    get_delays, so for those only the ray lengths are computed. The type of
+    rays is stored in the file for get_delays.
     '''
     log.debug('calculate_rays: Starting look vector calculation')
     log.debug('The integration stepsize is %f m', stepSize)
 
-    # get the lengths of each ray for doing the interpolation
-    getUnitLVs(pnts_file)
+    if delayType == "Zenith":
+        get_lengths(pnts_file)
+    else:
+        # get the lengths of each ray for doing the interpolation
+        getUnitLVs(pnts_file)
+
+        # This projects the ground pixels into earth-centered, earth-fixed coordinate
+        # system and sorts by position
+        lla2ecef(pnts_file)
 
-    # This projects the ground pixels into earth-centered, earth-fixed coordinate
-    # system and sorts by position
-    lla2ecef(pnts_file)
+    with h5py.File(pnts_file, 'r+') as f:
+        f.attrs['RayType'] = delayType
 
 
 def getUnitLVs(pnts_file):
@@ -84,14 +98,15 @@ def lla2ecef(pnts_file):
         lon[lon == ndv] = np.nan
         lat[lat == ndv] = np.nan
         hgt[hgt == ndv] = np.nan
-        sp = np.moveaxis(np.array(t.transform(lon, lat, hgt)), 0, -1)
-        f['Rays_SP'][...] = sp.astype(np.float64)  # ensure double is maintained
+        sp = np.stack(t.transform(lon, lat, hgt), axis=-1)
+        f['Rays_SP'][...] = sp.astype(np.float64, copy=False)  # ensure double is maintained
 
 
 def get_delays(stepSize, pnts_file, wm_file, interpType='3D',
-               delayType="Zenith", cpu_num=0):
+               delayType=None, cpu_num=0):
     '''
-    Create the integration points for each ray path.
+    Create the integration points for each ray path. delayType defaults to
+    the type of rays computed by calculate_rays for pnts_file.
     '''
 
     t0 = time.time()
@@ -103,6 +118,7 @@ def get_delays(stepSize, pnts_file, wm_file, interpType='3D',
         zs_wm = f['z'][()].copy()
         wet = f['wet'][()].copy()
         hydro = f['hydro'][()].copy()
+        proj_wm = CRS.from_json(f['Projection'][()])
 
     ifWet = Interpolator((ys_wm, xs_wm, zs_wm), wet, fill_value=np.nan)
     ifHydro = Interpolator((ys_wm, xs_wm, zs_wm), hydro, fill_value=np.nan)
@@ -113,20 +129,61 @@ def get_delays(stepSize, pnts_file, wm_file, interpType='3D',
         in_shape = f['lon'].attrs['Shape']
         arrSize = f['lon'].shape
         max_len = np.nanmax(f['Rays_len'])
+        ray_type = f.attrs.get('RayType')
+
+    if ray_type is None:
+        raise RuntimeError('get_delays: no rays in {}; run calculate_rays first'.format(pnts_file))
+    if delayType is None:
+        delayType = ray_type
+    elif delayType != "Zenith" and ray_type == "Zenith":
+        raise RuntimeError('get_delays: {} delays need the rays that calculate_rays skips for Zenith'.format(delayType))
 
     CHUNKS = chunk(chunkSize, in_shape)
     Nchunks = len(CHUNKS)
 
-    with h5py.File(pnts_file, 'r') as f:
-        chunk_inputs = [(kk, CHUNKS[kk], np.array(f['Rays_SP']), np.array(f['Rays_SLV']),
-                         chunkSize, stepSize, ifWet, ifHydro, max_len, wm_file) for kk in range(Nchunks)]
+    if delayType == "Zenith":
+        # Zenith rays follow the ellipsoid normal, so only the height changes
+        # along a ray. Project each ground point to the weather model once and
+        # skip ECEF altogether.
+        with h5py.File(pnts_file, 'r') as f:
+            ndv = f.attrs['NoDataValue']
+            lon = f['lon'][()]
+            lat = f['lat'][()]
+            hgt = f['hgt'][()]
+            lengths = f['Rays_len'][()]
+        lon[lon == ndv] = np.nan
+        lat[lat == ndv] = np.nan
+        hgt[hgt == ndv] = np.nan
 
-        with mp.Pool() as pool:
-            individual_results = pool.starmap(process_chunk, chunk_inputs)
-        delays = np.concatenate(individual_results)
+        t = Transformer.from_crs(CRS.from_epsg(4326), proj_wm, always_xy=True)
+        xs, ys = t.transform(lon, lat)
 
-    wet_delay = delays[0, ...].reshape(in_shape)
-    hydro_delay = delays[1, ...].reshape(in_shape)
+        worker = _process_zenith_chunk_worker
+        chunk_inputs = [(kk, xs[tuple(CHUNKS[kk])], ys[tuple(CHUNKS[kk])], hgt[tuple(CHUNKS[kk])],
+                         lengths[tuple(CHUNKS[kk])], stepSize, max_len) for kk in range(Nchunks)]
+    else:
+        # Read the rays once rather than once per chunk
+        with h5py.File(pnts_file, 'r') as f:
+            SP = f['Rays_SP'][()]
+            SLV = f['Rays_SLV'][()]
+            lengths = f['Rays_len'][()]
+
+        # Each chunk only gets its own rays
+        worker = _process_chunk_worker
+        chunk_inputs = [(kk, SP[tuple(CHUNKS[kk])], SLV[tuple(CHUNKS[kk])], lengths[tuple(CHUNKS[kk])],
+                         stepSize, max_len) for kk in range(Nchunks)]
+
+    # cpu_num < 1 means use all available processors
+    with mp.Pool(cpu_num if cpu_num > 0 else None, initializer=_init_worker,
+                 initargs=(ifWet, ifHydro, proj_wm)) as pool:
+        individual_results = pool.starmap(worker, chunk_inputs)
+
+    # Put the delays from each chunk back in place
+    wet_delay = np.empty(tuple(in_shape))
+    hydro_delay = np.empty(tuple(in_shape))
+    for chunkInds, delays in zip(CHUNKS, individual_results):
+        wet_delay[tuple(chunkInds)] = delays[0]
+        hydro_delay[tuple(chunkInds)] = delays[1]
 
     time_elapse = (time.time() - t0)
     with open('get_delays_time_elapse.txt', 'w') as f:
@@ -218,80 +275,147 @@ def makeChunksFromInds(startInd, chunkSize, in_shape):
          [np.array([2, 2, 3, 3]), np.array([0, 1, 0, 1])],
          [np.array([2, 2, 3, 3]), np.array([2, 3, 2, 3])]]
     '''
-    indices = []
-    for ci in startInd:
-        index = []
-        for si, k, dim in zip(ci, chunkSize, range(len(chunkSize))):
-            if si + k > in_shape[dim]:
-                dend = in_shape[dim]
-            else:
-                dend = si + k
-            index.append(np.array(range(si, dend)))
-        indices.append(index)
-
-    # Now create the index mesh (for Ndim > 1)
     chunks = []
-    if len(in_shape) > 1:
-        for index in indices:
-            chunks.append([np.array(g) for g in zip(*list(itertools.product(*index)))])
-    else:
-        chunks = indices
+    for ci in startInd:
+        index = [np.arange(si, min(si + k, dim)) for si, k, dim in zip(ci, chunkSize, in_shape)]
+
+        # Now create the index mesh (for Ndim > 1)
+        if len(in_shape) > 1:
+            index = [g.ravel() for g in np.meshgrid(*index, indexing='ij')]
+        chunks.append(index)
 
     return chunks
 
 
-def process_chunk(k, chunkInds, SP, SLV, chunkSize, stepSize, ifWet, ifHydro, max_len, wm_file):
+def _init_worker(ifWet, ifHydro, proj_wm):
+    '''
+    Store the interpolators and the transformer from ECEF to the weather
+    model projection in a worker process of get_delays
+    '''
+    _WORKER_STATE['wet'] = ifWet
+    _WORKER_STATE['hydro'] = ifHydro
+    _WORKER_STATE['transformer'] = Transformer.from_proj(CRS.from_epsg(4978), proj_wm, always_xy=True)
+
+
+def _process_chunk_worker(k, SP, SLV, lengths, stepSize, max_len):
+    '''
+    Call process_chunk using the state stored by _init_worker
+    '''
+    return process_chunk(
+        k, SP, SLV, lengths, stepSize,
+        _WORKER_STATE['wet'], _WORKER_STATE['hydro'],
+        max_len, _WORKER_STATE['transformer']
+    )
+
+
+def _process_zenith_chunk_worker(k, xs, ys, hgts, lengths, stepSize, max_len):
+    '''
+    Call process_zenith_chunk using the interpolators stored by _init_worker
+    '''
+    return process_zenith_chunk(
+        k, xs, ys, hgts, lengths, stepSize,
+        _WORKER_STATE['wet'], _WORKER_STATE['hydro'], max_len
+    )
+
+
+def process_zenith_chunk(k, xs, ys, hgts, lengths, stepSize, ifWet, ifHydro, max_len):
     """
-    Perform the interpolation and integration over a single chunk.
+    Perform the interpolation and integration over a single chunk of zenith
+    rays. xs and ys are the ground points in the weather model projection and
+    hgts their heights; the points along each ray are at the same x/y every
+    stepSize meters up. Returns a 2xN array holding the wet and hydrostatic
+    delays.
     """
-    # Transformer from ECEF to weather model
-    p1 = CRS.from_epsg(4978)
-    proj_wm = getProjFromWMFile(wm_file)
-    t = Transformer.from_proj(p1, proj_wm, always_xy=True)
+    # Same sampling as makePoints1D, keeping only the points below zref
+    steps = np.arange(0, max_len, stepSize)
+    keep, starts = get_valid_samples(lengths, stepSize, len(steps))
+    ray_z = (hgts[..., np.newaxis] + steps)[keep]
+    ray_x = np.broadcast_to(xs[..., np.newaxis], keep.shape)[keep]
+    ray_y = np.broadcast_to(ys[..., np.newaxis], keep.shape)[keep]
+
+    delay_wet, delay_hydro = interpolate_both(ifWet, ifHydro, ray_x, ray_y, ray_z)
+
+    return np.stack([_integrate_segments(stepSize, d, starts) for d in (delay_wet, delay_hydro)], axis=0)
 
+
+def process_chunk(k, SP, SLV, lengths, stepSize, ifWet, ifHydro, max_len, t):
+    """
+    Perform the interpolation and integration over a single chunk.
+    SP and SLV are the Nx3 start positions and unit look vectors of the rays
+    in the chunk, and lengths the N ray lengths. t is the transformer from
+    ECEF to the weather model projection. Returns a 2xN array holding the
+    wet and hydrostatic delays.
+    """
     # datatype must be specific for the cython makePoints* function
     _DTYPE = np.float64
+    ray = makePoints1D(max_len, SP.astype(_DTYPE), SLV.astype(_DTYPE), stepSize)
 
-    # H5PY does not support fancy indexing with tuples, hence this if/else check
-    if len(chunkSize) == 1:
-        row = chunkInds[0]
-        ray = makePoints1D(max_len, SP[row, :].astype(_DTYPE), SLV[row, :].astype(_DTYPE), stepSize)
-    elif len(chunkSize) == 2:
-        row, col = chunkInds
-        ray = makePoints1D(max_len, SP[row, col, :].astype(_DTYPE), SLV[row, col, :].astype(_DTYPE), stepSize)
-    elif len(chunkSize) == 3:
-        row, col, zind = chunkInds
-        ray = makePoints1D(max_len, SP[row, col, zind, :].astype(_DTYPE), SLV[row, col, zind, :].astype(_DTYPE), stepSize)
-    else:
-        raise RuntimeError('Data in more than 4 dimensions is not supported')
+    # All rays are sampled out to max_len, but each one should only be
+    # integrated up to its own length (i.e. up to zref), so only those
+    # points are transformed and interpolated
+    keep, starts = get_valid_samples(lengths, stepSize, ray.shape[-1])
+    ray_x, ray_y, ray_z = t.transform(ray[:, 0, :][keep], ray[:, 1, :][keep], ray[:, 2, :][keep])
+    delay_wet, delay_hydro = interpolate_both(ifWet, ifHydro, ray_x, ray_y, ray_z)
 
-    ray_x, ray_y, ray_z = t.transform(ray[..., 0, :], ray[..., 1, :], ray[..., 2, :])
-    delay_wet = interpolate2(ifWet, ray_x, ray_y, ray_z)
-    delay_hydro = interpolate2(ifHydro, ray_x, ray_y, ray_z)
-    int_delays = _integrateLOS(stepSize, delay_wet, delay_hydro)
+    return np.stack([_integrate_segments(stepSize, d, starts) for d in (delay_wet, delay_hydro)], axis=0)
 
-    return int_delays
+
+def get_ray_cutoffs(lengths, stepSize):
+    '''
+    Returns the number of points along each ray that lie within the length
+    of that ray, for all rays at once.
+    Inputs:
+       lengths   - numpy array of ray lengths in meters
+       stepSize  - Distance between points along the ray-path
+    Outputs:
+       Npts      - integer numpy array of the same shape as lengths
+    '''
+    return np.floor(lengths / stepSize).astype(np.int64) + 1
 
 
-def getProjFromWMFile(wm_file):
+def get_valid_samples(lengths, stepSize, Nsteps):
     '''
-    Returns the projection of an HDF5 file
+    Returns a mask of the points along a set of rays that are used in the
+    integration, and where each ray starts once the masked points are
+    flattened.
+    Inputs:
+       lengths   - length-N numpy array of ray lengths in meters
+       stepSize  - Distance between points along the ray-path
+       Nsteps    - Number of points sampled along every ray
+    Outputs:
+       keep      - N x Nsteps boolean numpy array
+       starts    - length-N integer numpy array of the offsets of each ray
     '''
-    with h5py.File(wm_file, 'r') as f:
-        wm_proj = CRS.from_json(f['Projection'][()])
-    return wm_proj
+    # Every ray keeps at least its first point so that no segment is empty
+    counts = np.clip(get_ray_cutoffs(lengths, stepSize), 1, Nsteps)
+    keep = np.arange(Nsteps) < counts[..., np.newaxis]
+    starts = np.zeros(counts.shape, dtype=np.int64)
+    np.cumsum(counts[:-1], out=starts[1:])
+    return keep, starts
 
 
 def interpolate2(fun, x, y, z):
     '''
-    helper function to make the interpolation step cleaner
+    helper function to make the interpolation step cleaner. If the
+    interpolator has more than one value per node (e.g. stacked wet and
+    hydrostatic refractivity), those are kept in the trailing dimension.
     '''
     in_shape = x.shape
     out = fun((y.ravel(), x.ravel(), z.ravel()))  # note that this re-ordering is on purpose to match the weather model
-    outData = out.reshape(in_shape)
+    outData = out.reshape(in_shape + out.shape[1:])
     return outData
 
 
+def interpolate_both(ifWet, ifHydro, x, y, z):
+    '''
+    Same as interpolate2, but evaluates the wet and hydrostatic interpolators
+    on a single shared array of points
+    '''
+    in_shape = x.shape
+    pts = np.stack((y.ravel(), x.ravel(), z.ravel()), axis=-1)
+    return ifWet(pts).reshape(in_shape), ifHydro(pts).reshape(in_shape)
+
+
 def _integrateLOS(stepSize, wet_pw, hydro_pw, Npts=None):
     delays = []
     for d in (wet_pw, hydro_pw):
@@ -305,17 +429,44 @@ def _integrateLOS(stepSize, wet_pw, hydro_pw, Npts=None):
 def _integrate_delays(stepSize, refr, Npts=None):
     '''
     This function gets the actual delays by integrating the refractivity in
-    each node. Refractivity is given in the 'refr' variable.
+    each node. Refractivity is given in the 'refr' variable, with the points
+    along each ray in the last dimension. All rays are integrated at once;
+    if Npts is given, only the first Npts[i] points of ray i are used.
     '''
-    delays = []
     if Npts is not None:
-        for n, ray in zip(Npts, refr):
-            delays.append(int_fcn(ray, stepSize, n))
-    else:
-        for ray in refr:
-            delays.append(int_fcn(ray, stepSize))
-    return np.array(delays)
+        keep = np.arange(refr.shape[-1]) < np.asarray(Npts)[..., np.newaxis]
+        refr = np.where(keep, refr, np.nan)
+    return 1e-6 * stepSize * np.nansum(refr, axis=-1, dtype=np.float64)
+
+
+def _integrate_zenith(refr, zs):
+    '''
+    Integrate refractivity from each height level up to the top of the
+    weather model using the trapezoid rule. This is equivalent to calling
+    np.trapz(refr[..., level:], x=zs[level:]) for every level, but sums the
+    trapezoids only once.
+    Inputs:
+        refr - array with the height levels in the last dimension
+        zs   - 1-D array of heights of the levels
+    Outputs:
+        total - array of the same shape as refr with the integrated delay
+                at each level (zero at the top level)
+    '''
+    segments = 0.5 * np.diff(zs) * (refr[..., 1:] + refr[..., :-1])
+    total = np.zeros(refr.shape)
+    total[..., :-1] = 1e-6 * np.cumsum(segments[..., ::-1], axis=-1)[..., ::-1]
+    return total
+
+
+def _integrate_segments(stepSize, refr, starts):
+    '''
+    Integrate refractivity given as the concatenated points of a set of rays,
+    where ray i starts at index starts[i] of refr. NaNs in refr are set to
+    zero in place.
+    '''
+    np.copyto(refr, 0, where=np.isnan(refr))
+    return 1e-6 * stepSize * np.add.reduceat(refr, starts, dtype=np.float64)
 
 
 def int_fcn(y, dx, N=None):
-    return 1e-6 * dx * np.nansum(y[:N])
+    return 1e-6 * dx * np.nansum(y[:N], dtype=np.float64)
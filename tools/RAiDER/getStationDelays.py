@@ -106,10 +106,11 @@ def get_delays(stationFile, filename, returnTime=None):
         # check for missing times
         true_times = list(range(0, 86400, 300))
         if len(timesList) != len(true_times):
-            missing = [
-                True if t not in timesList else False for t in true_times]
-            mask = np.array(missing)
-            delay, sig, east_grad, north_grad = [np.full((288,), np.nan)] * 4
+            # set lookup, rather than scanning timesList for every true time
+            observed = frozenset(timesList)
+            mask = np.array([t not in observed for t in true_times])
+            delay, sig, east_grad, north_grad = [
+                np.full((288,), np.nan) for _ in range(4)]
             delay[~mask] = d
             sig[~mask] = Sig
             east_grad[~mask] = egrad
@@ -83,15 +83,12 @@ def getHeights(lats, lons, heights, useWeatherNodes=False):
         if height_data is not None and useWeatherNodes:
             hts = height_data
         elif height_data is not None:
-            hts = height_data
-            latlist, lonlist, hgtlist = [], [], []
-            for ht in hts:
-                latlist.append(lats.flatten())
-                lonlist.append(lons.flatten())
-                hgtlist.append(np.array([ht] * len(lats.flatten())))
-            lats = np.array(latlist).reshape(in_shape + (len(height_data),))
-            lons = np.array(lonlist).reshape(in_shape + (len(height_data),))
-            hts = np.array(hgtlist).reshape(in_shape + (len(height_data),))
+            # Every point is repeated at each height level along a new last
+            # axis. These are read-only broadcast views, not copies.
+            out_shape = in_shape + (len(height_data),)
+            hts = np.broadcast_to(np.asarray(height_data, dtype=np.float64), out_shape)
+            lats = np.broadcast_to(np.asarray(lats)[..., np.newaxis], out_shape)
+            lons = np.broadcast_to(np.asarray(lons)[..., np.newaxis], out_shape)
         else:
             raise RuntimeError('Heights must be specified with height option "lvs"')
 
@@ -130,9 +127,8 @@ def checkArg(arg):
     if arg is None:
         return None
     else:
-        import numpy as np
         try:
-            return np.array(arg)
+            return np.asarray(arg)
         except:
             raise RuntimeError('checkArg: Cannot covert argument to numpy arrays')
 
@@ -82,14 +82,14 @@ def state_to_los(t, x, y, z, vx, vy, vz, lats, lons, heights, zref=_ZREF):
         raise RuntimeError('state_to_los: lats and lons must be the same size')
 
     real_shape = lats.shape
-    lats = lats.flatten()
-    lons = lons.flatten()
-    heights = heights.flatten()
+    lats = lats.ravel()
+    lons = lons.ravel()
+    heights = heights.ravel()
 
     geo2rdr_obj = Geo2rdr.PyGeo2rdr()
     geo2rdr_obj.set_orbit(t, x, y, z, vx, vy, vz)
 
-    loss = np.zeros((3, len(lats)))
+    loss = np.empty((len(lats), 3))
     slant_ranges = np.zeros_like(lats)
 
     for i, (lat, lon, height) in enumerate(zip(lats, lons, heights)):
@@ -104,9 +104,8 @@ def state_to_los(t, x, y, z, vx, vy, vz, lats, lons, heights, zref=_ZREF):
         # compute the radar coordinate for each geo coordinate
         geo2rdr_obj.geo2rdr()
 
-        # get back the line of sight unit vector
-        los_x, los_y, los_z = geo2rdr_obj.get_los()
-        loss[:, i] = los_x, los_y, los_z
+        # get back the line of sight unit vector; each component is a 1x1 array
+        loss[i] = np.ravel(geo2rdr_obj.get_los())
 
         # get back the slant ranges
         # slant_range = geo2rdr_obj.get_slant_range()  #<- geo2rdr returns the slant range to sensor...not exactly what we want
@@ -116,11 +115,10 @@ def state_to_los(t, x, y, z, vx, vy, vz, lats, lons, heights, zref=_ZREF):
     #sp = np.stack(utilFcns.lla2ecef(lats, lons, heights),axis = -1)
     #pt_rng = np.linalg.norm(sp,axis=-1)
     #slant_ranges = slant_ranges - pt_rng
-    los = -loss  # * slant_ranges
+    los = np.negative(loss, out=loss)  # * slant_ranges
 
-    # Have to think about traversal order here. It's easy, though, since
-    # in both orders xs come first, followed by all ys, followed by all
-    # zs.
+    # loss is already ordered point by point, with the x/y/z components in
+    # the last dimension, so this reshape keeps each vector together
     return los.reshape(real_shape + (3,))
 
 
@@ -253,25 +251,24 @@ def los_to_lv(incidence, heading, lats, lons, heights, zref, ranges=None):
     a_0 = incidence
     a_1 = heading
 
-    east = utilFcns.sind(a_0) * utilFcns.cosd(a_1 + 90)
-    north = utilFcns.sind(a_0) * utilFcns.sind(a_1 + 90)
+    sin_inc = utilFcns.sind(a_0)
+    east = sin_inc * utilFcns.cosd(a_1 + 90)
+    north = sin_inc * utilFcns.sind(a_1 + 90)
     up = utilFcns.cosd(a_0)
-    east, north, up = np.stack((east, north, up))
 
     # Pick reasonable range to top of troposphere if not provided
     if ranges is None:
         ranges = (zref - heights) / up
     #slant_range = ranges = (zref - heights) / utilFcns.cosd(inc)
 
-    # Scale look vectors by range
-    east, north, up = np.stack((east, north, up)) * ranges
+    # Scale look vectors by range. Each component is kept as its own array
+    # and only stacked into the output at the end
+    east, north, up = east * ranges, north * ranges, up * ranges
 
-    xyz = utilFcns.enu2ecef(
-        east.flatten(), north.flatten(), up.flatten(), lats.flatten(),
-        lons.flatten(), heights.flatten())
-
-    sp_xyz = utilFcns.lla2ecef(lats.flatten(), lons.flatten(), heights.flatten())
-    los = np.stack(xyz, axis=-1) - np.stack(sp_xyz, axis=-1)
+    # The LOS is just the look vector rotated from ENU to ECEF, so there is
+    # no need to project the ground point and the sensor end separately
+    los = np.stack(utilFcns.enu2ecef_vector(
+        east.ravel(), north.ravel(), up.ravel(), lats.ravel(), lons.ravel()), axis=-1)
     los = los.reshape(east.shape + (3,))
 
     return los
@@ -287,7 +284,7 @@ def infer_los(los, lats, lons, heights, zref, time=None):
     if los_type == 'sv':
         LOS = infer_sv(los_file, lats, lons, heights, time)
     elif los_type == 'los':
-        incidence, heading = [f.flatten() for f in utilFcns.gdal_open(los_file)]
+        incidence, heading = [f.ravel() for f in utilFcns.gdal_open(los_file)]
         utilFcns.checkShapes(np.stack((incidence, heading), axis=-1), lats, lons, heights)
         LOS = los_to_lv(incidence, heading, lats, lons, heights, zref)
     else:
@@ -314,11 +311,17 @@ def _getZenithLookVecs(lats, lons, heights, zref=_ZREF):
     if hasattr(zref, "__len__") | isinstance(zref, str):
         raise RuntimeError('_getZenithLookVecs: zref must be a scalar')
 
-    e = np.cos(np.radians(lats)) * np.cos(np.radians(lons))
-    n = np.cos(np.radians(lats)) * np.sin(np.radians(lons))
-    u = np.sin(np.radians(lats))
-    zenLookVecs = (np.array((e, n, u)).T * (zref - heights)[..., np.newaxis])
-    return zenLookVecs.astype(np.float64)
+    lat_rad = np.radians(lats)
+    lon_rad = np.radians(lons)
+    cos_lat = np.cos(lat_rad)
+    lengths = zref - heights
+
+    # Fill the Nx3 output directly rather than stacking and transposing
+    zenLookVecs = np.empty((len(lats), 3), dtype=np.float64)
+    zenLookVecs[:, 0] = cos_lat * np.cos(lon_rad) * lengths
+    zenLookVecs[:, 1] = cos_lat * np.sin(lon_rad) * lengths
+    zenLookVecs[:, 2] = np.sin(lat_rad) * lengths
+    return zenLookVecs
 
 
 def getLookVectors(look_vecs, lats, lons, heights, zref=_ZREF, time=None):
@@ -330,9 +333,9 @@ def getLookVectors(look_vecs, lats, lons, heights, zref=_ZREF, time=None):
         look_vecs = Zenith
 
     in_shape = lats.shape
-    lat = lats.flatten()
-    lon = lons.flatten()
-    hgt = heights.flatten()
+    lat = lats.ravel()
+    lon = lons.ravel()
+    hgt = heights.ravel()
 
     if look_vecs is Zenith:
         look_vecs = _getZenithLookVecs(lat, lon, hgt, zref=zref)
@@ -342,4 +345,4 @@ def getLookVectors(look_vecs, lats, lons, heights, zref=_ZREF, time=None):
     mask = np.isnan(hgt) | np.isnan(lat) | np.isnan(lon)
     look_vecs[mask, :] = np.nan
 
-    return look_vecs.reshape(in_shape + (3,)).astype(np.float64)
+    return look_vecs.reshape(in_shape + (3,)).astype(np.float64, copy=False)
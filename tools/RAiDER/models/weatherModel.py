@@ -10,7 +10,9 @@ from pyproj import CRS, Transformer
 from RAiDER import constants as const
 from RAiDER import utilFcns as util
 from RAiDER.constants import Zenith
-from RAiDER.delayFcns import _integrateLOS, interpolate2, make_interpolator
+from RAiDER.delayFcns import (
+    _integrate_zenith, _integrateLOS, interpolate2, make_interpolator
+)
 from RAiDER.interpolate import interpolate_along_axis
 from RAiDER.interpolator import fillna3D
 from RAiDER.losreader import getLookVectors
@@ -182,9 +184,10 @@ class WeatherModel(ABC):
             # Transform each point to ECEF
             rays_ecef = np.stack(lla2ecef(self._lats, self._lons, hgts), axis=-1)
 
-            # Calculate the integrated delays
-            ifWet = make_interpolator(self._xs, self._ys, self._zs, wet)
-            ifHydro = make_interpolator(self._xs, self._ys, self._zs, hydro)
+            # Calculate the integrated delays. A single interpolator over the
+            # stacked wet and hydrostatic refractivity locates each point in
+            # the grid only once.
+            ifDelays = make_interpolator(self._xs, self._ys, self._zs, np.stack((wet, hydro), axis=-1))
 
             # Create the rays
             ray = makePoints3D(max_len, rays_ecef, los_slv, _STEP)
@@ -196,23 +199,17 @@ class WeatherModel(ABC):
                 ray[..., 2, :]
             )
 
-            delay_wet = interpolate2(ifWet, ray_x, ray_y, ray_z)
-            delay_hydro = interpolate2(ifHydro, ray_x, ray_y, ray_z)
-            delays = _integrateLOS(_STEP, delay_wet, delay_hydro)
+            delays_pw = interpolate2(ifDelays, ray_x, ray_y, ray_z)
+            delays = _integrateLOS(_STEP, delays_pw[..., 0], delays_pw[..., 1])
 
-            self._wet_total = delays[..., 0]
-            self._hydrostatic_total = delays[..., 1]
+            self._wet_total = delays[0]
+            self._hydrostatic_total = delays[1]
 
         else:
-            # If LOS is not supplied, return integrated ZTD
-            wet_total, hydro_total = np.zeros(wet.shape), np.zeros(hydro.shape)
-            # TODO: This returns zero for the last level because of the way trapz handles single points.
-            # Should probably try to re-implement the integral function
-            for level in range(wet.shape[2]):
-                wet_total[..., level] = 1e-6 * np.trapz(wet[..., level:], x=self._zs[level:], axis=2)
-                hydro_total[..., level] = 1e-6 * np.trapz(hydro[..., level:], x=self._zs[level:], axis=2)
-            self._hydrostatic_total = hydro_total
-            self._wet_total = wet_total
+            # If LOS is not supplied, return integrated ZTD. The top level
+            # has nothing above it, so its total is zero.
+            self._hydrostatic_total = _integrate_zenith(hydro, self._zs)
+            self._wet_total = _integrate_zenith(wet, self._zs)
 
     @abstractmethod
     def load_weather(self, *args, **kwargs):
@@ -616,6 +613,12 @@ class WeatherModel(ABC):
                 ) + '.h5'
             )
 
+        # Chunk and compress the 3-D fields that are only kept for reference.
+        # gzip rather than lzf so that non-h5py readers can still open the
+        # file. The refractivity fields are read in full for every delay
+        # calculation, so they are left contiguous and uncompressed.
+        opts = dict(chunks=True, compression='gzip', compression_opts=1, shuffle=True)
+
         with h5py.File(outName, 'w') as f:
             x = f.create_dataset('x', data=self._xs.astype(np.float64))
             y = f.create_dataset('y', data=self._ys.astype(np.float64))
@@ -624,8 +627,8 @@ class WeatherModel(ABC):
             y.make_scale('y - weather model native')
             z.make_scale('z - weather model native')
 
-            lats = f.create_dataset('lat', data=self._lats.astype(np.float64))
-            lons = f.create_dataset('lon', data=self._lons.astype(np.float64))
+            lats = f.create_dataset('lat', data=self._lats.astype(np.float64), **opts)
+            lons = f.create_dataset('lon', data=self._lons.astype(np.float64), **opts)
             lats.dims[0].attach_scale(x)
             lats.dims[1].attach_scale(y)
             lats.dims[2].attach_scale(z)
@@ -633,17 +636,17 @@ class WeatherModel(ABC):
             lons.dims[1].attach_scale(y)
             lons.dims[2].attach_scale(z)
 
-            t = f.create_dataset('t', data=self._t)
+            t = f.create_dataset('t', data=self._t, **opts)
             t.dims[0].attach_scale(x)
             t.dims[1].attach_scale(y)
             t.dims[2].attach_scale(z)
 
-            p = f.create_dataset('p', data=self._p)
+            p = f.create_dataset('p', data=self._p, **opts)
             p.dims[0].attach_scale(x)
             p.dims[1].attach_scale(y)
             p.dims[2].attach_scale(z)
 
-            e = f.create_dataset('e', data=self._e)
+            e = f.create_dataset('e', data=self._e, **opts)
             e.dims[0].attach_scale(x)
             e.dims[1].attach_scale(y)
             e.dims[2].attach_scale(z)
@@ -773,8 +773,8 @@ class RaiderStats(object):
                 zvalues = gridarr[2]
                 # define the bins and normalize
                 if cbounds is None:
-                    cbounds = [np.nanpercentile(zvalues, self.colorpercentile[0]), np.nanpercentile(
-                        zvalues, self.colorpercentile[1])]
+                    # both bounds from a single pass over the data
+                    cbounds = list(np.nanpercentile(zvalues, self.colorpercentile))
                     # if upper/lower bounds identical, overwrite lower bound as 75% of upper bound to avoid plotting ValueError
                     if cbounds[0] == cbounds[1]:
                         cbounds[0] *= 0.75
@@ -802,8 +802,8 @@ class RaiderStats(object):
                 'physical', 'ocean', '50m', facecolor='#ADD8E6'), zorder=0)
             # define the bins and normalize
             if cbounds is None:
-                cbounds = [np.nanpercentile(gridarr, self.colorpercentile[0]), np.nanpercentile(
-                    gridarr, self.colorpercentile[1])]
+                # both bounds from a single pass over the data
+                cbounds = list(np.nanpercentile(gridarr, self.colorpercentile))
                 # if upper/lower bounds identical, overwrite lower bound as 75% of upper bound to avoid plotting ValueError
                 if cbounds[0] == cbounds[1]:
                     cbounds[0] *= 0.75
@@ -1,4 +1,5 @@
 """Geodesy-related utility functions."""
+import functools
 import importlib
 import logging
 import multiprocessing as mp
@@ -29,11 +30,16 @@ def cosd(x):
     return np.cos(np.radians(x))
 
 
-def lla2ecef(lat, lon, height):
-    ecef = pyproj.Proj(proj='geocent')
-    lla = pyproj.Proj(proj='latlong')
+@functools.lru_cache(maxsize=None)
+def _lla2ecef_transformer():
+    '''
+    WGS84 geodetic to WGS84 geocentric transformer, built only once
+    '''
+    return pyproj.Transformer.from_crs(4326, 4978, always_xy=True)
 
-    return pyproj.transform(lla, ecef, lon, lat, height, always_xy=True)
+
+def lla2ecef(lat, lon, height):
+    return _lla2ecef_transformer().transform(lon, lat, height)
 
 
 def enu2ecef(east, north, up, lat0, lon0, h0):
@@ -41,16 +47,20 @@ def enu2ecef(east, north, up, lat0, lon0, h0):
     # I'm looking at
     # https://github.com/scivision/pymap3d/blob/master/pymap3d/__init__.py
     x0, y0, z0 = lla2ecef(lat0, lon0, h0)
+    u, v, w = enu2ecef_vector(east, north, up, lat0, lon0)
 
+    return x0 + u, y0 + v, z0 + w
+
+
+def enu2ecef_vector(east, north, up, lat0, lon0):
+    """Rotate a vector from enu components at lat0/lon0 to ecef components."""
     t = cosd(lat0) * up - sind(lat0) * north
     w = sind(lat0) * up + cosd(lat0) * north
 
     u = cosd(lon0) * t - sind(lon0) * east
     v = sind(lon0) * t + cosd(lon0) * east
 
-    my_ecef = np.stack((x0 + u, y0 + v, z0 + w))
-
-    return my_ecef
+    return u, v, w
 
 
 def gdal_open(fname, returnProj=False, userNDV=None):
@@ -63,28 +73,23 @@ def gdal_open(fname, returnProj=False, userNDV=None):
     proj = ds.GetProjection()
     gt = ds.GetGeoTransform()
 
-    val = []
+    # Read all of the bands in one pass, then mask each band in place
+    data = ds.ReadAsArray()
+    bands = data[np.newaxis, ...] if ds.RasterCount == 1 else data
     for band in range(ds.RasterCount):
         b = ds.GetRasterBand(band + 1)  # gdal counts from 1, not 0
-        data = b.ReadAsArray()
         if userNDV is not None:
             log.debug('Using user-supplied NoDataValue')
-            data[data == userNDV] = np.nan
+            bands[band][bands[band] == userNDV] = np.nan
         else:
             try:
                 ndv = b.GetNoDataValue()
-                data[data == ndv] = np.nan
+                bands[band][bands[band] == ndv] = np.nan
             except:
                 log.debug('NoDataValue attempt failed*******')
-        val.append(data)
         b = None
     ds = None
 
-    if len(val) > 1:
-        data = np.stack(val)
-    else:
-        data = val[0]
-
     if not returnProj:
         return data
     else:
@@ -309,6 +314,7 @@ def checkLOS(los, Npts):
     return los
 
 
+@functools.lru_cache(maxsize=None)
 def modelName2Module(model_name):
     """Turn an arbitrary string into a module name.
     Takes as input a model name, which hopefully looks like ERA-I, and
@@ -321,9 +327,10 @@ def modelName2Module(model_name):
        module_name - Name of the module
        wmObject    - callable, weather model object
     """
-    module_name = 'RAiDER.models.' + model_name.lower().replace('-', '')
+    name = model_name.replace('-', '')
+    module_name = 'RAiDER.models.' + name.lower()
     model_module = importlib.import_module(module_name)
-    wmObject = getattr(model_module, model_name.upper().replace('-', ''))
+    wmObject = getattr(model_module, name.upper())
     return module_name, wmObject
 
 
@@ -442,7 +449,7 @@ def writePnts2HDF5(lats, lons, hgts, los, outName='testx.h5', chunkSize=None, no
             z.attrs['standard_name'] = np.string_("height")
             z.attrs['units'] = np.string_("m")
         else:
-            raise NotImplemented
+            raise NotImplementedError('writePnts2HDF5: only EPSG 4326 is supported')
 
         start_positions = f.create_dataset('Rays_SP', in_shape + (3,), chunks=los.chunks, dtype='<f8', fillvalue=noDataValue)
         lengths = f.create_dataset('Rays_len', in_shape, chunks=x.chunks, dtype='<f8', fillvalue=noDataValue)
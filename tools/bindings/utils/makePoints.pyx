@@ -26,6 +26,7 @@ def makePoints0D(double max_len, cnp.ndarray[double, ndim=1] Rays_SP, cnp.ndarra
            line-of-sight vectors, up to the maximum length specified.
     '''
     cdef int k3, k4
+    cdef double sp, slv
     cdef int Npts  
     if max_len % stepSize != 0:
         Npts = int(max_len//stepSize) + 1
@@ -33,11 +34,12 @@ def makePoints0D(double max_len, cnp.ndarray[double, ndim=1] Rays_SP, cnp.ndarra
         Npts = int(max_len//stepSize)
 
     cdef cnp.ndarray[npy_float64, ndim = 2, mode = 'c'] ray = np.empty((3, Npts), dtype=np.float64)
-    cdef cnp.ndarray[npy_float64, ndim = 1, mode = 'c'] basespace = np.arange(0, max_len+stepSize, stepSize) 
 
     for k3 in range(3):
+        sp = Rays_SP[k3]
+        slv = Rays_SLV[k3]
         for k4 in range(Npts):
-            ray[k3, k4] = Rays_SP[k3] + basespace[k4]*Rays_SLV[k3]
+            ray[k3, k4] = sp + (k4*stepSize)*slv
     return ray
 
 @cython.boundscheck(False)  # turn off array bounds check
@@ -56,6 +58,7 @@ def makePoints1D(double max_len, cnp.ndarray[double, ndim=2] Rays_SP, cnp.ndarra
            line-of-sight vectors, up to the maximum length specified.
     '''
     cdef int k1, k3, k4
+    cdef double sp, slv
     cdef int Npts  
 
     if max_len % stepSize != 0:
@@ -65,12 +68,13 @@ def makePoints1D(double max_len, cnp.ndarray[double, ndim=2] Rays_SP, cnp.ndarra
 
     cdef int nrow = Rays_SP.shape[0]
     cdef cnp.ndarray[npy_float64, ndim = 3, mode = 'c'] ray = np.empty((nrow, 3, Npts), dtype=np.float64)
-    cdef cnp.ndarray[npy_float64, ndim = 1, mode = 'c'] basespace = np.arange(0, max_len+stepSize, stepSize) 
 
     for k1 in range(nrow):
         for k3 in range(3):
+            sp = Rays_SP[k1, k3]
+            slv = Rays_SLV[k1, k3]
             for k4 in range(Npts):
-                ray[k1, k3, k4] = Rays_SP[k1, k3] + basespace[k4]*Rays_SLV[k1, k3]
+                ray[k1, k3, k4] = sp + (k4*stepSize)*slv
     return ray
 
 
@@ -90,6 +94,7 @@ def makePoints2D(double max_len, cnp.ndarray[double, ndim=3] Rays_SP, cnp.ndarra
            line-of-sight vectors, up to the maximum length specified.
     '''
     cdef int k1, k2, k3, k4
+    cdef double sp, slv
 
     cdef int Npts  
     if max_len % stepSize != 0:
@@ -100,13 +105,14 @@ def makePoints2D(double max_len, cnp.ndarray[double, ndim=3] Rays_SP, cnp.ndarra
     cdef int nrow = Rays_SP.shape[0]
     cdef int ncol = Rays_SP.shape[1]
     cdef cnp.ndarray[npy_float64, ndim = 4, mode = 'c'] ray = np.empty((nrow, ncol, 3, Npts), dtype=np.float64)
-    cdef cnp.ndarray[npy_float64, ndim = 1, mode = 'c'] basespace = np.arange(0, max_len+stepSize, stepSize) 
 
     for k1 in range(nrow):
         for k2 in range(ncol):
             for k3 in range(3):
+                sp = Rays_SP[k1, k2, k3]
+                slv = Rays_SLV[k1, k2, k3]
                 for k4 in range(Npts):
-                    ray[k1, k2, k3, k4] = Rays_SP[k1, k2, k3] + basespace[k4]*Rays_SLV[k1, k2, k3]
+                    ray[k1, k2, k3, k4] = sp + (k4*stepSize)*slv
     return ray
 
 
@@ -126,6 +132,7 @@ def makePoints3D(double max_len, cnp.ndarray[double, ndim=4] Rays_SP, cnp.ndarra
            line-of-sight vectors, up to the maximum length specified.
     '''
     cdef int k1, k2, k2a, k3, k4
+    cdef double sp, slv
 
     cdef int Npts  
     if max_len % stepSize != 0:
@@ -137,12 +144,13 @@ def makePoints3D(double max_len, cnp.ndarray[double, ndim=4] Rays_SP, cnp.ndarra
     cdef int ncol = Rays_SP.shape[1]
     cdef int nz = Rays_SP.shape[2]
     cdef cnp.ndarray[npy_float64, ndim = 5, mode = 'c'] ray = np.empty((nrow, ncol, nz, 3, Npts), dtype=np.float64)
-    cdef cnp.ndarray[npy_float64, ndim = 1, mode = 'c'] basespace = np.arange(0, max_len+stepSize, stepSize) 
 
     for k1 in range(nrow):
         for k2 in range(ncol):
             for k2a in range(nz):
                 for k3 in range(3):
+                    sp = Rays_SP[k1, k2, k2a, k3]
+                    slv = Rays_SLV[k1, k2, k2a, k3]
                     for k4 in range(Npts):
-                        ray[k1, k2, k2a, k3, k4] = Rays_SP[k1, k2, k2a, k3] + basespace[k4]*Rays_SLV[k1, k2, k2a, k3]
+                        ray[k1, k2, k2a, k3, k4] = sp + (k4*stepSize)*slv
     return ray